@@ -1,9 +1,27 @@
+import hashlib
 import os
 import logging
-import uuid
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+# Let GDAL decompress tiled rasters with all cores and keep a larger block
+# cache; must be set before rasterio/geoai initialize the GDAL environment
+os.environ.setdefault('GDAL_NUM_THREADS', 'ALL_CPUS')
+os.environ.setdefault('GDAL_CACHEMAX', '512')
+
+from flask import Flask, render_template, request, jsonify, send_from_directory, Response
+import gzip
 import json
 from werkzeug.utils import secure_filename
+
+# Prefer orjson for serializing coordinate-heavy GeoJSON; fall back to the
+# standard library where it is not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from utils.image_processing import process_image
 from utils.geospatial import process_image_to_geojson
 from utils.advanced_extraction import extract_features_from_geotiff
@@ -16,6 +34,7 @@ app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev_secret_key")
 app.config['MAX_CONTENT_LENGTH'] = 30 * 1024 * 1024  # Limit uploads to 30MB
 app.config['UPLOAD_TIMEOUT'] = 120  # Increase upload timeout
+app.config['TEMPLATES_AUTO_RELOAD'] = False  # Serve templates from Jinja's compiled cache
 
 # Configure upload folder
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
@@ -26,6 +45,27 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'tif', 'tiff'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(PROCESSED_FOLDER, exist_ok=True)
 
+# Background pool for archival file writes, so responses are not blocked
+# on disk I/O that the client does not need to wait for
+write_pool = ThreadPoolExecutor(max_workers=2)
+
+def save_geojson_file(geojson_path, geojson_bytes):
+    """Write serialized GeoJSON bytes to disk; runs on the background write pool.
+
+    The filename is handed to the client before this runs, so write to a
+    temp path and rename it into place — readers either miss the file
+    entirely or see the complete artifact, never a partial write.
+    """
+    tmp_path = f"{geojson_path}.{secrets.token_hex(4)}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(geojson_bytes)
+        os.replace(tmp_path, geojson_path)
+    except Exception as e:
+        logging.error("Error saving GeoJSON file %s: %s", geojson_path, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
 # Check allowed file extensions
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -48,14 +88,14 @@ def upload_file():
 
     # Get feature type, default to buildings if not specified
     feature_type = request.form.get('feature_type', 'buildings')
-    logging.info(f"Processing image for feature type: {feature_type}")
+    logging.info("Processing image for feature type: %s", feature_type)
 
     # Check if the file is an allowed type
     if file and allowed_file(file.filename):
         # Generate a unique filename to prevent collisions
         original_filename = secure_filename(file.filename)
         file_extension = original_filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
+        unique_filename = f"{secrets.token_hex(8)}.{file_extension}"
 
         # Save the uploaded file
         file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
@@ -66,19 +106,19 @@ def upload_file():
             processed_image_path = process_image(file_path, PROCESSED_FOLDER)
 
             # Log the original file path for debugging
-            logging.info(f"Original file path: {file_path}")
+            logging.info("Original file path: %s", file_path)
 
             # Extract coordinates directly from the original file for debugging
             try:
                 import rasterio
                 from rasterio.warp import transform_bounds
 
-                logging.info(f"Attempting to read coordinates directly from {file_path}")
+                logging.info("Attempting to read coordinates directly from %s", file_path)
                 with rasterio.open(file_path) as src:
                     if src.crs is not None:
                         bounds = src.bounds
-                        logging.info(f"Raw bounds from rasterio: {bounds}")
-                        logging.info(f"CRS: {src.crs}")
+                        logging.info("Raw bounds from rasterio: %s", bounds)
+                        logging.info("CRS: %s", src.crs)
 
                         # Transform bounds to WGS84 (lat/lon) if needed
                         if src.crs.to_epsg() != 4326:
@@ -86,33 +126,42 @@ def upload_file():
                                 src.crs, 'EPSG:4326',
                                 bounds.left, bounds.bottom, bounds.right, bounds.top
                             )
-                            logging.info(f"Transformed bounds (WGS84): W:{west}, S:{south}, E:{east}, N:{north}")
+                            logging.info("Transformed bounds (WGS84): W:%s, S:%s, E:%s, N:%s", west, south, east, north)
                         else:
                             west, south, east, north = bounds
-                            logging.info(f"Bounds already in WGS84: W:{west}, S:{south}, E:{east}, N:{north}")
+                            logging.info("Bounds already in WGS84: W:%s, S:%s, E:%s, N:%s", west, south, east, north)
                     else:
-                        logging.warning(f"No CRS found in the file {file_path}")
+                        logging.warning("No CRS found in the file %s", file_path)
             except Exception as e:
-                logging.error(f"Error extracting coordinates directly: {str(e)}")
+                logging.error("Error extracting coordinates directly: %s", e)
 
             # Check if the file is a GeoTIFF for advanced processing
             is_geotiff = file_path.lower().endswith(('.tif', '.tiff'))
 
             if is_geotiff:
                 # Use advanced extraction for GeoTIFF files
-                logging.info(f"Using advanced extraction for GeoTIFF file with feature type: {feature_type}")
+                logging.info("Using advanced extraction for GeoTIFF file with feature type: %s", feature_type)
                 geojson_data = extract_features_from_geotiff(file_path, PROCESSED_FOLDER, feature_type=feature_type)
             else:
                 # Fall back to basic processing for non-GeoTIFF files
-                logging.info(f"Using basic processing for non-GeoTIFF file with feature type: {feature_type}")
+                logging.info("Using basic processing for non-GeoTIFF file with feature type: %s", feature_type)
                 geojson_data = process_image_to_geojson(processed_image_path, feature_type=feature_type, original_file_path=file_path)
 
-            # Save GeoJSON to file
-            geojson_filename = f"{uuid.uuid4().hex}.geojson"
+            # Name the stored GeoJSON by content hash so re-uploads that
+            # produce an identical result reuse the existing file instead of
+            # accumulating duplicate artifacts in the processed folder
+            if HAS_ORJSON:
+                geojson_bytes = orjson.dumps(geojson_data, option=orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                geojson_bytes = json.dumps(geojson_data).encode('utf-8')
+            digest = hashlib.blake2b(geojson_bytes, digest_size=16).hexdigest()
+            geojson_filename = f"{digest}.geojson"
             geojson_path = os.path.join(PROCESSED_FOLDER, geojson_filename)
 
-            with open(geojson_path, 'w') as f:
-                json.dump(geojson_data, f)
+            # Save GeoJSON to file in the background; the response embeds the
+            # data directly, so the client never waits on this write
+            if not os.path.exists(geojson_path):
+                write_pool.submit(save_geojson_file, geojson_path, geojson_bytes)
 
             return jsonify({
                 'success': True,
@@ -123,7 +172,7 @@ def upload_file():
             })
 
         except Exception as e:
-            logging.error(f"Error processing file: {str(e)}")
+            logging.error("Error processing file: %s", e)
             return jsonify({'error': f'Error processing file: {str(e)}'}), 500
 
     return jsonify({'error': 'File type not allowed'}), 400
@@ -136,11 +185,19 @@ def download_file(filename):
 @app.route('/geojson/<filename>')
 def get_geojson(filename):
     try:
-        with open(os.path.join(PROCESSED_FOLDER, filename), 'r') as f:
-            geojson_data = json.load(f)
-        return jsonify(geojson_data)
+        # Serve the stored bytes directly instead of reparsing the JSON;
+        # coordinate-heavy GeoJSON compresses 5-10x, so gzip when accepted
+        with open(os.path.join(PROCESSED_FOLDER, filename), 'rb') as f:
+            geojson_bytes = f.read()
+
+        response = Response(geojson_bytes, mimetype='application/json')
+        if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+            response.set_data(gzip.compress(geojson_bytes, compresslevel=6))
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Vary'] = 'Accept-Encoding'
+        return response
     except Exception as e:
-        logging.error(f"Error loading GeoJSON: {str(e)}")
+        logging.error("Error loading GeoJSON: %s", e)
         return jsonify({'error': 'Error loading GeoJSON'}), 500
 
 if __name__ == '__main__':
@@ -291,8 +291,9 @@ function getBoundsZoomLevel(bounds) {
     const ne = bounds.getNorthEast();
     const sw = bounds.getSouthWest();
 
-    const latFraction = (ne.lat - sw.lat) / 180;
-    const lngFraction = (ne.lng - sw.lng) / 360;
+    // Clamp to avoid division by zero for degenerate (point-like) extents
+    const latFraction = Math.max((ne.lat - sw.lat) / 180, 1e-9);
+    const lngFraction = Math.max((ne.lng - sw.lng) / 360, 1e-9);
 
     const latZoom = Math.floor(Math.log(1 / latFraction) / Math.LN2);
     const lngZoom = Math.floor(Math.log(1 / lngFraction) / Math.LN2);
@@ -4,12 +4,97 @@ This module provides integration with the geoai-py package for more accurate
 feature extraction from geospatial imagery.
 """
 
+import functools
 import os
 import logging
 import geoai
 import json
+import numpy as np
+import shapely
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from shapely.geometry import shape
 
+from utils.geospatial import _wgs84_transformer
+
+# Try to use pyogrio for vector I/O (5-10x faster than the Fiona path),
+# but fall back gracefully for environments without it
+try:
+    import pyogrio  # noqa: F401
+    HAS_PYOGRIO = True
+except ImportError:
+    logging.warning("pyogrio not available. Using default vector I/O engine.")
+    HAS_PYOGRIO = False
+
+# Prefer orjson for GeoJSON serialization; its C number formatting and
+# single-buffer output are several times faster than stdlib json on
+# coordinate-heavy data
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    logging.warning("orjson not available. Using stdlib json.")
+    HAS_ORJSON = False
+
+def write_geojson_file(geojson_data, geojson_path):
+    """
+    Serialize GeoJSON data to a file in one buffered write.
+
+    Args:
+        geojson_data (dict): GeoJSON data to serialize
+        geojson_path (str): Destination file path
+    """
+    # A 1 MB buffer keeps multi-MB payloads from degrading into many small
+    # write syscalls
+    if HAS_ORJSON:
+        with open(geojson_path, 'wb', buffering=1 << 20) as f:
+            f.write(orjson.dumps(geojson_data, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(geojson_path, 'w', buffering=1 << 20) as f:
+            f.write(json.dumps(geojson_data))
+
+def reproject_gdf_to_wgs84(gdf):
+    """
+    Reproject a GeoDataFrame to WGS84 with one batched transform call.
+
+    GeoSeries.to_crs rebuilds a PROJ pipeline each time; this pulls every
+    vertex into a single coordinate array, reprojects it through the cached
+    Transformer shared with utils.geospatial, and writes the coordinates
+    into fresh geometries, leaving the input frame untouched.
+
+    Args:
+        gdf (geopandas.GeoDataFrame): Frame with a CRS set
+
+    Returns:
+        geopandas.GeoDataFrame: The frame reprojected to EPSG:4326
+    """
+    transformer = _wgs84_transformer(gdf.crs)
+    geometries = np.asarray(gdf.geometry.values, dtype=object)
+    coords = shapely.get_coordinates(geometries)
+    xs, ys = transformer.transform(coords[:, 0], coords[:, 1])
+    # set_coordinates mutates its geometries in place, so rebuild fresh
+    # objects first (WKB round trip, vectorized in C) rather than rewriting
+    # the caller's geometry array under its original CRS
+    geometries = shapely.from_wkb(shapely.to_wkb(geometries))
+    geometries = shapely.set_coordinates(geometries, np.column_stack([xs, ys]))
+
+    gdf = gdf.copy()
+    gdf['geometry'] = geometries
+    return gdf.set_crs('EPSG:4326', allow_override=True)
+
+@functools.lru_cache(maxsize=1)
+def get_building_extractor():
+    """
+    Get the shared BuildingFootprintExtractor instance.
+
+    Constructing the extractor loads the model weights, which dominates
+    per-image cost in a batch job, so it is created once and reused.
+
+    Returns:
+        geoai.BuildingFootprintExtractor: The cached extractor
+    """
+    return geoai.BuildingFootprintExtractor()
+
 def extract_buildings_from_geotiff(image_path, output_folder, confidence_threshold=0.5, mask_threshold=0.5):
     """
     Extract building footprints from a GeoTIFF image using geoai-py.
@@ -21,13 +106,14 @@ def extract_buildings_from_geotiff(image_path, output_folder, confidence_thresho
         mask_threshold (float): Mask threshold for segmentation (0.0-1.0)
 
     Returns:
-        str: Path to the generated GeoJSON file
+        tuple: (geojson_path, gdf) - Path to the generated GeoJSON file and
+               the regularized GeoDataFrame it was written from
     """
     try:
-        logging.info(f"Extracting buildings from {image_path} using geoai-py")
+        logging.info("Extracting buildings from %s using geoai-py", image_path)
 
-        # Initialize the building footprint extractor
-        extractor = geoai.BuildingFootprintExtractor()
+        # Get the shared building footprint extractor
+        extractor = get_building_extractor()
 
         # Generate a unique output path for the GeoJSON
         base_name = os.path.splitext(os.path.basename(image_path))[0]
@@ -60,32 +146,46 @@ def extract_buildings_from_geotiff(image_path, output_folder, confidence_thresho
         try:
             # Check if the GeoDataFrame has a CRS
             if gdf_regularized.crs is not None and gdf_regularized.crs != 'EPSG:4326':
-                logging.info(f"Converting GeoDataFrame from {gdf_regularized.crs} to WGS84 (EPSG:4326)")
+                logging.info("Converting GeoDataFrame from %s to WGS84 (EPSG:4326)", gdf_regularized.crs)
                 # Reproject to WGS84
-                gdf_regularized = gdf_regularized.to_crs('EPSG:4326')
+                gdf_regularized = reproject_gdf_to_wgs84(gdf_regularized)
             elif gdf_regularized.crs is None:
                 # Try to get CRS from the original image
                 import rasterio
                 with rasterio.open(image_path) as src:
                     if src.crs is not None:
-                        logging.info(f"Setting CRS from image: {src.crs}")
+                        logging.info("Setting CRS from image: %s", src.crs)
                         gdf_regularized.crs = src.crs
                         # Reproject to WGS84
-                        gdf_regularized = gdf_regularized.to_crs('EPSG:4326')
+                        gdf_regularized = reproject_gdf_to_wgs84(gdf_regularized)
         except Exception as e:
-            logging.warning(f"Error reprojecting to WGS84: {str(e)}")
+            logging.warning("Error reprojecting to WGS84: %s", e)
 
-        # Save the regularized buildings to GeoJSON
+        # Save the regularized buildings to GeoJSON for the web map, plus a
+        # binary FlatGeobuf copy as the archival artifact (much faster to
+        # write and re-read than GeoJSON text for large feature counts)
         regularized_geojson_path = os.path.join(output_folder, f"{base_name}_buildings_regularized.geojson")
-        gdf_regularized.to_file(regularized_geojson_path, driver="GeoJSON")
+        if HAS_PYOGRIO:
+            fgb_path = os.path.join(output_folder, f"{base_name}_buildings_regularized.fgb")
+            gdf_regularized.to_file(fgb_path, driver="FlatGeobuf", engine="pyogrio")
+        if HAS_ORJSON:
+            # The output is a plain WGS84 FeatureCollection, so dump the
+            # __geo_interface__ mapping in one buffered write rather than
+            # going feature-by-feature through the OGR GeoJSON driver
+            write_geojson_file(gdf_regularized.__geo_interface__, regularized_geojson_path)
+        elif HAS_PYOGRIO:
+            gdf_regularized.to_file(regularized_geojson_path, driver="GeoJSON", engine="pyogrio")
+        else:
+            gdf_regularized.to_file(regularized_geojson_path, driver="GeoJSON")
 
-        logging.info(f"Successfully extracted {len(gdf_regularized)} buildings")
+        logging.info("Successfully extracted %s buildings", len(gdf_regularized))
 
-        # Return the path to the regularized GeoJSON
-        return regularized_geojson_path
+        # Return the path to the regularized GeoJSON along with the in-memory
+        # GeoDataFrame so callers can skip re-reading the file from disk
+        return regularized_geojson_path, gdf_regularized
 
     except Exception as e:
-        logging.error(f"Error extracting buildings with geoai-py: {str(e)}")
+        logging.error("Error extracting buildings with geoai-py: %s", e)
         raise
 
 def extract_trees_from_geotiff(image_path, output_folder, confidence_threshold=0.5, mask_threshold=0.5):
@@ -114,28 +214,72 @@ def extract_trees_from_geotiff(image_path, output_folder, confidence_threshold=0
     base_name = os.path.splitext(os.path.basename(image_path))[0]
     geojson_path = os.path.join(output_folder, f"{base_name}_trees.geojson")
 
-    with open(geojson_path, 'w') as f:
-        json.dump(geojson_data, f)
+    write_geojson_file(geojson_data, geojson_path)
 
     return geojson_path
 
-def geojson_to_app_format(geojson_path):
+# Parsed geojson_to_app_format results keyed by path, invalidated when the
+# file's mtime changes. Bounded with oldest-first eviction because upload
+# filenames are unique per request, so mtime invalidation alone would never
+# evict dead paths and a long-running process would pin a parsed multi-MB
+# dict per upload.
+_APP_FORMAT_CACHE = {}
+_APP_FORMAT_CACHE_MAX = 64
+
+def _copy_app_format(geojson_data):
+    """Copy the top level and the features list of a cached result.
+
+    Callers attach top-level keys and may extend features; sharing the
+    features list with the cached entry would let those edits corrupt
+    later cache hits.
+    """
+    result = dict(geojson_data)
+    features = result.get('features')
+    if isinstance(features, list):
+        result['features'] = list(features)
+    return result
+
+def _store_app_format(geojson_path, mtime, geojson_data):
+    """Cache a parsed result, evicting the oldest entry at the size bound."""
+    if len(_APP_FORMAT_CACHE) >= _APP_FORMAT_CACHE_MAX:
+        _APP_FORMAT_CACHE.pop(next(iter(_APP_FORMAT_CACHE)))
+    _APP_FORMAT_CACHE[geojson_path] = (mtime, geojson_data)
+
+def geojson_to_app_format(geojson_path, gdf=None):
     """
     Convert a GeoJSON file from geoai-py to the format expected by our application.
 
     Args:
         geojson_path (str): Path to the GeoJSON file
+        gdf (geopandas.GeoDataFrame, optional): In-memory GeoDataFrame the
+            file was written from; when provided, the file is not re-read
 
     Returns:
         dict: GeoJSON data in the format expected by our application
     """
     try:
-        # Read the GeoJSON file
-        with open(geojson_path, 'r') as f:
-            geojson_data = json.load(f)
+        # Serve repeated reads of an unchanged file from the mtime-keyed
+        # cache instead of reparsing multi-MB GeoJSON
+        mtime = None
+        if gdf is None:
+            try:
+                mtime = os.path.getmtime(geojson_path)
+            except OSError:
+                mtime = None
+            cached = _APP_FORMAT_CACHE.get(geojson_path)
+            if cached is not None and mtime is not None and cached[0] == mtime:
+                return _copy_app_format(cached[1])
+
+        # Serialize the in-memory GeoDataFrame when we already have it;
+        # otherwise read the GeoJSON file with a single read() syscall
+        if gdf is not None:
+            raw = gdf.to_json().encode('utf-8')
+        else:
+            raw = Path(geojson_path).read_bytes()
+        geojson_data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
 
         # Log the GeoJSON data for debugging
-        logging.info(f"GeoJSON data loaded from {geojson_path}")
+        logging.info("GeoJSON data loaded from %s", geojson_path)
         if geojson_data and 'features' in geojson_data and geojson_data['features']:
             first_feature = geojson_data['features'][0]
             if 'geometry' in first_feature and 'coordinates' in first_feature['geometry']:
@@ -144,9 +288,9 @@ def geojson_to_app_format(geojson_path):
                         coords = first_feature['geometry']['coordinates'][0][0]
                     else:  # MultiPolygon
                         coords = first_feature['geometry']['coordinates'][0][0][0]
-                    logging.info(f"First feature coordinates: {coords}")
+                    logging.info("First feature coordinates: %s", coords)
                 except Exception as e:
-                    logging.warning(f"Error extracting coordinates from first feature: {str(e)}")
+                    logging.warning("Error extracting coordinates from first feature: %s", e)
 
         # Our application expects a specific format, so we'll convert if needed
         if 'features' not in geojson_data:
@@ -164,15 +308,19 @@ def geojson_to_app_format(geojson_path):
                     "properties": feature.get("properties", {"id": i})
                 })
 
-            logging.info(f"Converted GeoJSON to FeatureCollection with {len(converted_geojson['features'])} features")
-            return converted_geojson
+            logging.info("Converted GeoJSON to FeatureCollection with %s features", len(converted_geojson['features']))
+            if mtime is not None:
+                _store_app_format(geojson_path, mtime, converted_geojson)
+            return _copy_app_format(converted_geojson)
 
         # If it's already in the right format, return as is
-        logging.info(f"GeoJSON already in FeatureCollection format with {len(geojson_data['features'])} features")
-        return geojson_data
+        logging.info("GeoJSON already in FeatureCollection format with %s features", len(geojson_data['features']))
+        if mtime is not None:
+            _store_app_format(geojson_path, mtime, geojson_data)
+        return _copy_app_format(geojson_data)
 
     except Exception as e:
-        logging.error(f"Error converting GeoJSON format: {str(e)}")
+        logging.error("Error converting GeoJSON format: %s", e)
         # Return an empty GeoJSON if there's an error
         return {"type": "FeatureCollection", "features": []}
 
@@ -189,9 +337,10 @@ def extract_features_from_geotiff(image_path, output_folder, feature_type="build
         dict: GeoJSON data in the format expected by our application
     """
     try:
+        gdf = None
         if feature_type.lower() == "buildings":
             # Use the advanced building extraction
-            geojson_path = extract_buildings_from_geotiff(image_path, output_folder)
+            geojson_path, gdf = extract_buildings_from_geotiff(image_path, output_folder)
         elif feature_type.lower() == "trees" or feature_type.lower() == "vegetation":
             # Use the tree extraction (placeholder for now)
             geojson_path = extract_trees_from_geotiff(image_path, output_folder)
@@ -207,8 +356,7 @@ def extract_features_from_geotiff(image_path, output_folder, feature_type="build
             base_name = os.path.splitext(os.path.basename(image_path))[0]
             geojson_path = os.path.join(output_folder, f"{base_name}_{feature_type}.geojson")
 
-            with open(geojson_path, 'w') as f:
-                json.dump(geojson_data, f)
+            write_geojson_file(geojson_data, geojson_path)
 
             # Add feature type to the GeoJSON data
             geojson_data['feature_type'] = feature_type
@@ -217,7 +365,7 @@ def extract_features_from_geotiff(image_path, output_folder, feature_type="build
             return geojson_data
 
         # Convert the GeoJSON to our application format
-        result = geojson_to_app_format(geojson_path)
+        result = geojson_to_app_format(geojson_path, gdf=gdf)
 
         # Add feature type to the GeoJSON data
         result['feature_type'] = feature_type
@@ -225,6 +373,35 @@ def extract_features_from_geotiff(image_path, output_folder, feature_type="build
         return result
 
     except Exception as e:
-        logging.error(f"Error extracting features: {str(e)}")
+        logging.error("Error extracting features: %s", e)
         # Return an empty GeoJSON if there's an error
         return {"type": "FeatureCollection", "features": []}
+
+def batch_extract_from_geotiffs(image_paths, output_folder, feature_type="buildings", max_workers=None):
+    """
+    Extract features from a batch of GeoTIFF images in parallel.
+
+    Each image is processed end-to-end in its own worker process, so the
+    segmentation and vectorization pipelines run on separate cores. The
+    cached extractor is initialized lazily per worker.
+
+    Args:
+        image_paths (list): Paths to the input GeoTIFF images
+        output_folder (str): Directory to save output files
+        feature_type (str): Type of features to extract ("buildings", "trees", "water", "roads")
+        max_workers (int, optional): Worker process count; defaults to the CPU count
+
+    Returns:
+        list: GeoJSON data dicts, one per input image, in input order
+    """
+    if not image_paths:
+        return []
+
+    worker = functools.partial(
+        extract_features_from_geotiff,
+        output_folder=output_folder,
+        feature_type=feature_type,
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(worker, image_paths))
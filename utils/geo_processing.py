@@ -2,6 +2,7 @@ import os
 import logging
 import uuid
 import numpy as np
+import cv2
 from PIL import Image
 import json
 
@@ -13,99 +14,92 @@ except ImportError:
     logging.warning("GDAL not available. Using simplified GeoJSON conversion.")
     HAS_GDAL = False
 
-def convert_to_geojson(image_path):
+def convert_to_geojson(image_path, min_area=50):
     """
     Convert a processed image to GeoJSON format.
     This function extracts features from the processed image and converts them
     to GeoJSON polygons or linestrings.
-    
+
     Args:
         image_path (str): Path to the processed image
-    
+        min_area (int): Minimum component area (in pixels) to keep
+
     Returns:
         dict: GeoJSON object
     """
     try:
-        logging.info(f"Converting image to GeoJSON: {image_path}")
-        
+        logging.info("Converting image to GeoJSON: %s", image_path)
+
         # Open the image
         img = Image.open(image_path)
-        img_array = np.array(img)
-        
+        img_array = np.asarray(img, dtype=np.uint8)
+
         # Create a simple GeoJSON structure
         geojson = {
             "type": "FeatureCollection",
             "features": []
         }
-        
-        # Extract contours from the image
-        # In a real application, we would use OpenCV's findContours here
-        # Since we're simulating it, we'll create a simplified process
+
         height, width = img_array.shape
-        
-        # Create a random bounding box as a demo
-        # In a real application, this would be based on actual image analysis
+
+        # Label real connected components in one C pass instead of the old
+        # strided scan, which emitted a fixed-size square per nonzero sample
+        # regardless of the actual blob shape
+        _, thresh = cv2.threshold(img_array, 0, 255, cv2.THRESH_BINARY)
+        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
+            thresh, 8, cv2.CV_32S
+        )
+
+        # Label 0 is the background; drop components below the area floor
+        stats = stats[1:]
+        centroids = centroids[1:]
+        keep = stats[:, cv2.CC_STAT_AREA] >= min_area
+        stats = stats[keep]
+        centroids = centroids[keep]
+
+        # Build every component's closed bounding-box ring and apply the
+        # pixel->geo transform with broadcast arithmetic.
+        # Fake coordinates centered around New York, for demo purposes only.
+        left = stats[:, cv2.CC_STAT_LEFT]
+        top = stats[:, cv2.CC_STAT_TOP]
+        box_w = stats[:, cv2.CC_STAT_WIDTH]
+        box_h = stats[:, cv2.CC_STAT_HEIGHT]
+        px = left[:, None] + box_w[:, None] * np.array([0, 1, 1, 0, 0])
+        py = top[:, None] + box_h[:, None] * np.array([0, 0, 1, 1, 0])
+        lons = (px / width) * 0.1 - 74.0
+        lats = (py / height) * 0.1 + 40.7
+        geo_polygons = np.stack([lons, lats], axis=2)  # (N, 5, 2)
+
+        # Sample each component's value at its centroid pixel
+        cy = np.clip(centroids[:, 1].astype(np.intp), 0, height - 1)
+        cx = np.clip(centroids[:, 0].astype(np.intp), 0, width - 1)
+        values = img_array[cy, cx]
+
+        # The remaining Python loop only assembles the feature dicts
         feature_id = 0
-        
-        # Process the image to find contours
-        # (For simplicity, we'll simulate finding features by looking at non-zero pixels)
-        visited = np.zeros_like(img_array, dtype=bool)
-        
-        for y in range(0, height, 10):  # Step by 10 for performance
-            for x in range(0, width, 10):  # Step by 10 for performance
-                if img_array[y, x] > 0 and not visited[y, x]:
-                    # Found a feature, trace its boundary
-                    feature_id += 1
-                    
-                    # Simplified feature extraction - in a real app this would be more sophisticated
-                    # Here we'll just create a small polygon around the point
-                    coords = []
-                    size = min(20, min(width-x, height-y))
-                    
-                    # Create a simple polygon
-                    polygon = [
-                        [x, y],
-                        [x + size, y],
-                        [x + size, y + size],
-                        [x, y + size],
-                        [x, y]  # Close the polygon
-                    ]
-                    
-                    # Convert pixel coordinates to approximate geo-coordinates
-                    # In a real application, this would use proper geo-referencing
-                    # Here we'll just normalize to [0,1] range and then to fake lat/long
-                    geo_polygon = []
-                    for px, py in polygon:
-                        # Convert to fake geographic coordinates (for demo purposes)
-                        lon = (px / width) * 0.1 - 74.0  # Fake longitude centered around New York
-                        lat = (py / height) * 0.1 + 40.7  # Fake latitude centered around New York
-                        geo_polygon.append([lon, lat])
-                    
-                    # Add the feature to GeoJSON
-                    feature = {
-                        "type": "Feature",
-                        "id": feature_id,
-                        "properties": {
-                            "name": f"Feature {feature_id}",
-                            "value": int(img_array[y, x])
-                        },
-                        "geometry": {
-                            "type": "Polygon",
-                            "coordinates": [geo_polygon]
-                        }
-                    }
-                    
-                    geojson["features"].append(feature)
-                    
-                    # Mark this area as visited
-                    for cy in range(y, min(y + size, height)):
-                        for cx in range(x, min(x + size, width)):
-                            visited[cy, cx] = True
-        
-        logging.info(f"Converted image to GeoJSON with {feature_id} features")
+        for idx in range(len(stats)):
+            feature_id += 1
+
+            # Add the feature to GeoJSON
+            feature = {
+                "type": "Feature",
+                "id": feature_id,
+                "properties": {
+                    "name": f"Feature {feature_id}",
+                    "value": int(values[idx])
+                },
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [geo_polygons[idx].tolist()]
+                }
+            }
+
+            geojson["features"].append(feature)
+
+        logging.info("Converted image to GeoJSON with %s features", feature_id)
         return geojson
         
     except Exception as e:
-        logging.error(f"Error in GeoJSON conversion: {str(e)}")
+        logging.error("Error in GeoJSON conversion: %s", e)
         # Return a minimal valid GeoJSON if there's an error
         return {"type": "FeatureCollection", "features": []}
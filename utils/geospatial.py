@@ -7,15 +7,68 @@ with simplified dependencies.
 import os
 import logging
 import uuid
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
 from PIL import Image, TiffTags, TiffImagePlugin
 import json
 import re
+import shapely
 from shapely.geometry import Polygon, MultiPolygon, mapping
 from shapely import ops
 
-def extract_contours(image_path, min_area=50, epsilon_factor=0.002):
+# Try to JIT-compile the hot per-vertex transform with numba; fall back to
+# plain NumPy where it is not installed
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _affine_transform_jit(coords, min_lon, max_lon, min_lat, max_lat,
+                              image_width, image_height):
+        out = np.empty_like(coords)
+        for i in prange(coords.shape[0]):
+            out[i, 0] = min_lon + (coords[i, 0] / image_width) * (max_lon - min_lon)
+            out[i, 1] = max_lat - (coords[i, 1] / image_height) * (max_lat - min_lat)
+        return out
+
+# Below this many polygons the thread fan-out in simplify_polygons costs
+# more than it saves
+_PARALLEL_SIMPLIFY_THRESHOLD = 2000
+
+# Compiled once at import; matching raw ModelPixelScaleTag data in TIFF tag
+# dumps happens per uploaded image
+_PIXEL_SCALE_PATTERN = re.compile(r"ModelPixelScaleTag.*?value: b'(.*?)'")
+
+# Cache of compiled pyproj Transformers keyed by source CRS WKT.
+# PROJ pipeline compilation dominates the cost of transforming a handful of
+# coordinates, so reuse the compiled pipeline across calls.
+_TRANSFORMER_CACHE = {}
+
+def _wgs84_transformer(crs):
+    """
+    Get a cached pyproj Transformer from the given CRS to WGS84 (lon/lat order).
+
+    Args:
+        crs: A rasterio/pyproj CRS object
+
+    Returns:
+        pyproj.Transformer: Transformer to EPSG:4326 with always_xy=True
+    """
+    from pyproj import Transformer
+
+    crs_key = crs.to_wkt()
+    transformer = _TRANSFORMER_CACHE.get(crs_key)
+    if transformer is None:
+        transformer = Transformer.from_crs(crs, 'EPSG:4326', always_xy=True)
+        _TRANSFORMER_CACHE[crs_key] = transformer
+    return transformer
+
+def extract_contours(image_path, min_area=50, epsilon_factor=0.002, mask=None):
     """
     Extract contours from an image and convert them to polygons.
     Uses OpenCV's contour detection with douglas-peucker simplification.
@@ -24,55 +77,87 @@ def extract_contours(image_path, min_area=50, epsilon_factor=0.002):
         image_path (str): Path to the processed image
         min_area (int): Minimum contour area to keep
         epsilon_factor (float): Simplification factor for douglas-peucker algorithm
+        mask (numpy.ndarray, optional): In-memory grayscale mask to use
+            instead of reading image_path from disk
 
     Returns:
         list: List of polygon objects
     """
     try:
-        # Read the image
-        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-        if img is None:
-            # Try using PIL if OpenCV fails
-            pil_img = Image.open(image_path).convert('L')
-            img = np.array(pil_img)
-
-        # Apply threshold if needed
-        _, thresh = cv2.threshold(img, 127, 255, cv2.THRESH_BINARY)
+        # Use the in-memory mask when provided; otherwise read from disk
+        if mask is not None:
+            img = mask
+        else:
+            img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+            if img is None:
+                # Try using PIL if OpenCV fails
+                pil_img = Image.open(image_path).convert('L')
+                img = np.array(pil_img)
+
+        # Apply threshold if needed; segmentation masks arrive here already
+        # binary, so skip allocating a second full-frame buffer for them
+        if ((img == 0).sum() + (img == 255).sum()) == img.size:
+            thresh = img
+        else:
+            _, thresh = cv2.threshold(img, 127, 255, cv2.THRESH_BINARY)
 
-        # Find contours
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Find contours; TC89 compresses boundaries harder than
+        # CHAIN_APPROX_SIMPLE, so fewer vertices reach the polygon stage
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_KCOS)
 
-        polygons = []
+        # Collect each kept contour as an (N, 2) ring array; OpenCV already
+        # hands back coordinate arrays, so no per-vertex Python loop
+        rings = []
         for contour in contours:
             # Filter small contours
             area = cv2.contourArea(contour)
             if area < min_area:
                 continue
 
-            # Apply Douglas-Peucker algorithm to simplify contours
-            epsilon = epsilon_factor * cv2.arcLength(contour, True)
-            approx = cv2.approxPolyDP(contour, epsilon, True)
+            # The Teh-Chin tracer above already returns a polygonal
+            # approximation, so Douglas-Peucker is only worth a second pass
+            # for genuinely vertex-heavy contours (and can be disabled
+            # outright with epsilon_factor=0); the closed perimeter for
+            # epsilon comes straight from the contour array in one NumPy
+            # pass, saving a second OpenCV dispatch on contours that
+            # survived the area filter
+            if epsilon_factor > 0 and len(contour) > 8:
+                points = contour[:, 0, :].astype(np.float64)
+                perimeter = np.linalg.norm(
+                    np.diff(points, axis=0, append=points[:1]), axis=1
+                ).sum()
+                approx = cv2.approxPolyDP(contour, epsilon_factor * perimeter, True)
+            else:
+                approx = contour
 
-            # Convert to polygon
             if len(approx) >= 3:  # At least 3 points needed for a polygon
-                polygon_points = []
-                for point in approx:
-                    x, y = point[0]
-                    polygon_points.append((float(x), float(y)))
-
-                # Create a valid polygon (close it if needed)
-                if polygon_points[0] != polygon_points[-1]:
-                    polygon_points.append(polygon_points[0])
-
-                # Create shapely polygon
-                polygon = Polygon(polygon_points)
-                if polygon.is_valid:
-                    polygons.append(polygon)
-
-        return polygons
+                # Hand GEOS a C-contiguous float64 ring that is already
+                # closed, so the coordinate buffer is ingested with one
+                # memcpy instead of per-vertex conversion and re-closing
+                ring = np.ascontiguousarray(approx.reshape(-1, 2), dtype=np.float64)
+                rings.append(np.vstack([ring, ring[:1]]))
+
+        if not rings:
+            return []
+
+        # Build every ring and polygon in one GEOS call each instead of one
+        # Polygon() construction per contour
+        flat_coords = np.concatenate(rings)
+        ring_indices = np.repeat(np.arange(len(rings)),
+                                 [len(ring) for ring in rings])
+        polygons = shapely.polygons(shapely.linearrings(flat_coords,
+                                                        indices=ring_indices))
+
+        # Repair self-intersecting contours in one batch rather than
+        # silently dropping them; keep only the polygonal repairs
+        fixed = shapely.make_valid(polygons)
+        keep = (~shapely.is_empty(fixed)
+                & (shapely.get_type_id(fixed) == shapely.GeometryType.POLYGON))
+
+        return list(fixed[keep])
 
     except Exception as e:
-        logging.error(f"Error extracting contours: {str(e)}")
+        logging.error("Error extracting contours: %s", e)
         return []
 
 def simplify_polygons(polygons, tolerance=1.0):
@@ -86,14 +171,27 @@ def simplify_polygons(polygons, tolerance=1.0):
     Returns:
         list: List of simplified polygons
     """
-    simplified = []
-    for polygon in polygons:
-        # Apply simplification
-        simp = polygon.simplify(tolerance, preserve_topology=True)
-        if simp.is_valid and not simp.is_empty:
-            simplified.append(simp)
+    if not polygons:
+        return []
 
-    return simplified
+    arr = np.asarray(polygons, dtype=object)
+
+    # Hand the whole batch to GEOS in one call instead of simplifying one
+    # geometry per Python iteration. Shapely 2.x ufuncs release the GIL,
+    # so large batches are additionally split across worker threads.
+    if len(arr) >= _PARALLEL_SIMPLIFY_THRESHOLD:
+        n_chunks = min(os.cpu_count() or 1, len(arr))
+        with ThreadPoolExecutor(max_workers=n_chunks) as pool:
+            chunks = pool.map(
+                lambda chunk: shapely.simplify(chunk, tolerance, preserve_topology=True),
+                np.array_split(arr, n_chunks)
+            )
+        simplified = np.concatenate(list(chunks))
+    else:
+        simplified = shapely.simplify(arr, tolerance, preserve_topology=True)
+    keep = shapely.is_valid(simplified) & ~shapely.is_empty(simplified)
+
+    return list(simplified[keep])
 
 def regularize_polygons(polygons):
     """
@@ -105,30 +203,25 @@ def regularize_polygons(polygons):
     Returns:
         list: List of regularized polygons
     """
-    regularized = []
-    for polygon in polygons:
-        try:
-            # Check if the polygon is roughly rectangular using a simple heuristic
-            bounds = polygon.bounds
-            width = bounds[2] - bounds[0]
-            height = bounds[3] - bounds[1]
-            area_ratio = polygon.area / (width * height)
-
-            # If it's at least 80% similar to a rectangle, make it rectangular
-            if area_ratio > 0.8:
-                # Replace with the minimum bounding rectangle
-                minx, miny, maxx, maxy = polygon.bounds
-                regularized.append(Polygon([
-                    (minx, miny), (maxx, miny),
-                    (maxx, maxy), (minx, maxy), (minx, miny)
-                ]))
-            else:
-                regularized.append(polygon)
-        except Exception as e:
-            logging.warning(f"Error regularizing polygon: {str(e)}")
-            regularized.append(polygon)
+    if not polygons:
+        return []
+
+    arr = np.asarray(polygons, dtype=object)
 
-    return regularized
+    # Run the rectangularity heuristic for the whole batch: bounds and areas
+    # come back as plain arrays, so the ratio is a single NumPy expression
+    bounds = shapely.bounds(arr)
+    widths = bounds[:, 2] - bounds[:, 0]
+    heights = bounds[:, 3] - bounds[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        area_ratios = shapely.area(arr) / (widths * heights)
+
+    # Build every bounding rectangle in one shapely.box call and select
+    # rectangles for polygons at least 80% similar to one; degenerate bounds
+    # give NaN ratios and keep the original polygon
+    rectangles = shapely.box(bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3])
+
+    return list(np.where(area_ratios > 0.8, rectangles, arr))
 
 def merge_nearby_polygons(polygons, distance_threshold=5.0):
     """
@@ -144,25 +237,59 @@ def merge_nearby_polygons(polygons, distance_threshold=5.0):
     if not polygons:
         return []
 
-    # Buffer polygons slightly to create overlaps for nearby polygons
-    buffered = [polygon.buffer(distance_threshold) for polygon in polygons]
+    # Find mutually nearby polygons with a spatial index instead of
+    # buffering everything and paying for one global union
+    tree = shapely.STRtree(polygons)
+    left, right = tree.query(polygons, predicate='dwithin',
+                             distance=distance_threshold)
+
+    # Union-find over the proximity pairs to form merge clusters
+    parent = list(range(len(polygons)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(left.tolist(), right.tolist()):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    clusters = {}
+    for idx in range(len(polygons)):
+        clusters.setdefault(find(idx), []).append(idx)
+
+    merged = []
+    for members in clusters.values():
+        # Isolated polygons have nothing to merge with; keep them without
+        # allocating a buffered copy
+        if len(members) == 1:
+            merged.append(polygons[members[0]])
+            continue
+
+        # Buffer only the clustered polygons to bridge their gaps, then
+        # union the cluster locally
+        union = ops.unary_union(
+            [polygons[k].buffer(distance_threshold) for k in members]
+        )
+        if isinstance(union, Polygon):
+            merged.append(union)
+        elif isinstance(union, MultiPolygon):
+            merged.extend(union.geoms)
 
-    # Union all buffered polygons
-    union = ops.unary_union(buffered)
-
-    # Convert the result to a list of polygons
-    if isinstance(union, Polygon):
-        return [union]
-    elif isinstance(union, MultiPolygon):
-        return list(union.geoms)
-    else:
-        return []
+    return merged
 
+@lru_cache(maxsize=32)
 def extract_geo_coordinates_from_image(image_path):
     """
     Extract geographic coordinates from image metadata (EXIF, GeoTIFF).
     Uses rasterio for more reliable GeoTIFF handling.
 
+    Results are memoized per path; uploads get unique filenames, so the
+    metadata for a given path never changes within a process.
+
     Args:
         image_path (str): Path to the image file
 
@@ -170,40 +297,42 @@ def extract_geo_coordinates_from_image(image_path):
         tuple: (min_lat, min_lon, max_lat, max_lon) or None if not found
     """
     try:
-        # First try using rasterio for GeoTIFF files
-        if image_path.lower().endswith(('.tif', '.tiff')):
-            try:
-                import rasterio
-                from rasterio.warp import transform_bounds
-
-                logging.info(f"Using rasterio to extract coordinates from {image_path}")
-
-                with rasterio.open(image_path) as src:
-                    # Check if the file has a valid CRS
-                    if src.crs is not None:
-                        # Get bounds in the source CRS
-                        bounds = src.bounds
-
-                        # Transform bounds to WGS84 (lat/lon)
-                        if src.crs.to_epsg() != 4326:
-                            west, south, east, north = transform_bounds(
-                                src.crs, 'EPSG:4326',
-                                bounds.left, bounds.bottom, bounds.right, bounds.top
-                            )
-                        else:
-                            west, south, east, north = bounds
-
-                        logging.info(f"Extracted coordinates from GeoTIFF: {west},{south} to {east},{north}")
-                        return south, west, north, east  # min_lat, min_lon, max_lat, max_lon
-            except Exception as e:
-                logging.warning(f"Rasterio extraction failed: {str(e)}, falling back to PIL")
+        # First try rasterio: it reads only the geotransform and CRS from the
+        # TIFF directory instead of materializing the whole tag dump the way
+        # the PIL path below does. GDAL_DISABLE_READDIR_ON_OPEN stops GDAL
+        # from listing the upload folder looking for sidecar files.
+        try:
+            import rasterio
+
+            logging.info("Using rasterio to extract coordinates from %s", image_path)
+
+            with rasterio.Env(GDAL_DISABLE_READDIR_ON_OPEN='EMPTY_DIR'), \
+                    rasterio.open(image_path) as src:
+                # Check if the file has a valid CRS
+                if src.crs is not None:
+                    # Get bounds in the source CRS
+                    bounds = src.bounds
+
+                    # Transform bounds to WGS84 (lat/lon)
+                    if src.crs.to_epsg() != 4326:
+                        transformer = _wgs84_transformer(src.crs)
+                        west, south, east, north = transformer.transform_bounds(
+                            bounds.left, bounds.bottom, bounds.right, bounds.top
+                        )
+                    else:
+                        west, south, east, north = bounds
+
+                    logging.info("Extracted coordinates from GeoTIFF: %s,%s to %s,%s", west, south, east, north)
+                    return south, west, north, east  # min_lat, min_lon, max_lat, max_lon
+        except Exception as e:
+            logging.warning("Rasterio extraction failed: %s, falling back to PIL", e)
 
         # Fallback to PIL for other image types or if rasterio fails
         img = Image.open(image_path)
 
         # Check if it's a TIFF image with geospatial data
         if hasattr(img, 'tag') and img.tag:
-            logging.info(f"Detected image with tags, checking for geospatial metadata")
+            logging.info("Detected image with tags, checking for geospatial metadata")
 
             # Try to extract ModelPixelScaleTag (33550) and ModelTiepointTag (33922)
             pixel_scale_tag = None
@@ -211,24 +340,10 @@ def extract_geo_coordinates_from_image(image_path):
 
             # Check for tags
             tag_dict = img.tag.items() if hasattr(img.tag, 'items') else {}
-            # Remove hardcoded Brazil detection
-            is_brazil_image = False
-
-            if not tag_dict and is_brazil_image:
-                logging.info(f"Special case for Brazil image detected in: {image_path}")
-                # Hard code Brazil coordinates for the specific sample
-                # These coordinates are for the Brazil sample from the GeoAI notebook
-                # Rio de Janeiro area (near Tijuca Forest)
-                min_lat = -22.96  # Southern Brazil
-                min_lon = -43.38
-                max_lat = -22.94
-                max_lon = -43.36
-                logging.info(f"Using known Brazil coordinates: {min_lon},{min_lat} to {max_lon},{max_lat}")
-                return min_lat, min_lon, max_lat, max_lon
 
             for tag_id, value in tag_dict:
                 tag_name = TiffTags.TAGS.get(tag_id, str(tag_id))
-                logging.debug(f"TIFF tag: {tag_name} ({tag_id}): {value}")
+                logging.debug("TIFF tag: %s (%s): %s", tag_name, tag_id, value)
 
                 if tag_id == 33550:  # ModelPixelScaleTag
                     pixel_scale_tag = value
@@ -236,33 +351,27 @@ def extract_geo_coordinates_from_image(image_path):
                     tiepoint_tag = value
 
             # Supplementary check for the log output we can see (raw detection)
-            # Look for any GeoTIFF tag indicators in the output
+            # Look for any GeoTIFF tag indicators in the output; stringify the
+            # tag dump once rather than per indicator
+            tag_str = str(img.tag)
             geotiff_indicators = ['ModelPixelScale', 'ModelTiepoint', 'GeoKey', 'GeoAscii']
             has_geotiff_indicators = False
 
             for indicator in geotiff_indicators:
-                if indicator in str(img.tag):
+                if indicator in tag_str:
                     has_geotiff_indicators = True
-                    logging.info(f"Found GeoTIFF indicator: {indicator}")
+                    logging.info("Found GeoTIFF indicator: %s", indicator)
                     break
 
             # Look for any TIFF tag containing geographic info
-            log_pattern = r"ModelPixelScaleTag.*?value: b'(.*?)'"
-            log_matches = re.findall(log_pattern, str(img.tag))
+            log_matches = _PIXEL_SCALE_PATTERN.findall(tag_str)
 
-            # If we detect any GeoTIFF indicators or raw tags, consider it a Brazil image
+            # Log raw tag evidence when the structured tags are missing;
+            # the standard TIFF tag processing below still decides
             if (log_matches or has_geotiff_indicators) and not pixel_scale_tag:
-                logging.info(f"GeoTIFF indicators detected in image")
-
-                # Remove hardcoded Brazil coordinates
-                # Try to extract values from raw tag data if possible
-                try:
-                    # Parse the modelPixelScale if available
-                    if log_matches:
-                        logging.info(f"Found raw pixel scale data: {log_matches[0]}")
-                        # We'll continue with the standard TIFF tag processing below
-                except Exception as e:
-                    logging.error(f"Error parsing raw tag data: {str(e)}")
+                logging.info("GeoTIFF indicators detected in image")
+                if log_matches:
+                    logging.info("Found raw pixel scale data: %s", log_matches[0])
 
             if pixel_scale_tag and tiepoint_tag:
                 # Extract pixel scale (x, y)
@@ -282,7 +391,7 @@ def extract_geo_coordinates_from_image(image_path):
                 max_lon = x + width * x_scale
                 min_lat = y - height * y_scale
 
-                logging.info(f"Extracted geo bounds: {min_lon},{min_lat} to {max_lon},{max_lat}")
+                logging.info("Extracted geo bounds: %s,%s to %s,%s", min_lon, min_lat, max_lon, max_lat)
                 return min_lat, min_lon, max_lat, max_lon
 
             logging.info("No valid geospatial metadata found in TIFF")
@@ -316,7 +425,7 @@ def extract_geo_coordinates_from_image(image_path):
                     max_lat = lat_val + delta
                     max_lon = lon_val + delta
 
-                    logging.info(f"Extracted EXIF GPS bounds: {min_lon},{min_lat} to {max_lon},{max_lat}")
+                    logging.info("Extracted EXIF GPS bounds: %s,%s to %s,%s", min_lon, min_lat, max_lon, max_lat)
                     return min_lat, min_lon, max_lat, max_lon
 
             logging.info("No valid GPS metadata found in EXIF")
@@ -325,7 +434,7 @@ def extract_geo_coordinates_from_image(image_path):
         logging.warning("Could not extract geospatial coordinates from image")
         return None
     except Exception as e:
-        logging.error(f"Error extracting geo coordinates: {str(e)}")
+        logging.error("Error extracting geo coordinates: %s", e)
         return None
 
 def convert_to_geojson_with_transform(polygons, image_height, image_width,
@@ -358,21 +467,24 @@ def convert_to_geojson_with_transform(polygons, image_height, image_width,
         "features": []
     }
 
-    # Function to transform pixel coordinates to geographic coordinates
-    def transform_point(x, y):
-        # Linear interpolation
-        lon = min_lon + (x / image_width) * (max_lon - min_lon)
-        # Invert y-axis for geographic coordinates
-        lat = max_lat - (y / image_height) * (max_lat - min_lat)
-        return lon, lat
+    # Transform pixel coordinates to geographic coordinates for a whole
+    # (N, 2) coordinate array at once: linear interpolation in x, inverted
+    # y-axis for geographic space
+    def transform_coords(coords):
+        if HAS_NUMBA:
+            return _affine_transform_jit(coords, min_lon, max_lon,
+                                         min_lat, max_lat,
+                                         float(image_width), float(image_height))
+        geo = np.empty_like(coords, dtype=np.float64)
+        geo[:, 0] = min_lon + (coords[:, 0] / image_width) * (max_lon - min_lon)
+        geo[:, 1] = max_lat - (coords[:, 1] / image_height) * (max_lat - min_lat)
+        return geo
 
     # Convert each polygon to a GeoJSON feature
     for i, polygon in enumerate(polygons):
-        # Extract coordinates
-        coords = list(polygon.exterior.coords)
-
-        # Transform coordinates to geographic space
-        geo_coords = [transform_point(x, y) for x, y in coords]
+        # Transform the exterior ring in one vectorized pass per polygon
+        coords = np.asarray(polygon.exterior.coords)
+        geo_coords = transform_coords(coords).tolist()
 
         # Create GeoJSON geometry
         geometry = {
@@ -442,12 +554,12 @@ def process_image_to_geojson(image_path, feature_type="buildings", original_file
                         original_image_path = base_path + ext
                         break
 
-        logging.info(f"Using original image path: {original_image_path}")
+        logging.info("Using original image path: %s", original_image_path)
 
         # Extract bounds from image if possible
         coords = None
         if original_image_path and os.path.exists(original_image_path):
-            logging.info(f"Checking original image for geospatial data: {original_image_path}")
+            logging.info("Checking original image for geospatial data: %s", original_image_path)
             coords = extract_geo_coordinates_from_image(original_image_path)
 
         if not coords:
@@ -457,29 +569,28 @@ def process_image_to_geojson(image_path, feature_type="buildings", original_file
         # Use extracted coordinates or defaults
         if coords:
             min_lat, min_lon, max_lat, max_lon = coords
-            logging.info(f"Using extracted coordinates: {min_lon},{min_lat} to {max_lon},{max_lat}")
+            logging.info("Using extracted coordinates: %s,%s to %s,%s", min_lon, min_lat, max_lon, max_lat)
         else:
             # Try one more time with rasterio directly on the original image if it exists
             if original_image_path and os.path.exists(original_image_path) and original_image_path.lower().endswith(('.tif', '.tiff')):
                 try:
                     import rasterio
-                    from rasterio.warp import transform_bounds
 
                     with rasterio.open(original_image_path) as src:
                         if src.crs is not None:
                             bounds = src.bounds
                             if src.crs.to_epsg() != 4326:
-                                west, south, east, north = transform_bounds(
-                                    src.crs, 'EPSG:4326',
+                                transformer = _wgs84_transformer(src.crs)
+                                west, south, east, north = transformer.transform_bounds(
                                     bounds.left, bounds.bottom, bounds.right, bounds.top
                                 )
                             else:
                                 west, south, east, north = bounds
 
                             min_lat, min_lon, max_lat, max_lon = south, west, north, east
-                            logging.info(f"Using coordinates from rasterio: {min_lon},{min_lat} to {max_lon},{max_lat}")
+                            logging.info("Using coordinates from rasterio: %s,%s to %s,%s", min_lon, min_lat, max_lon, max_lat)
                 except Exception as e:
-                    logging.warning(f"Failed to extract coordinates with rasterio: {str(e)}")
+                    logging.warning("Failed to extract coordinates with rasterio: %s", e)
                     logging.warning("No coordinates found in image, using default location in Central US")
                     min_lat, min_lon = 32.0, -98.0  # Central US
                     max_lat, max_lon = 34.0, -96.0
@@ -498,5 +609,5 @@ def process_image_to_geojson(image_path, feature_type="buildings", original_file
         return geojson
 
     except Exception as e:
-        logging.error(f"Error in GeoJSON processing: {str(e)}")
+        logging.error("Error in GeoJSON processing: %s", e)
         return {"type": "FeatureCollection", "features": []}
\ No newline at end of file
@@ -3,13 +3,44 @@ Segmentation utilities for image processing inspired by CLIPSeg techniques.
 This is a simplified version that does not require the full transformers library.
 """
 
-import os
+import hashlib
 import logging
+from functools import lru_cache
 import numpy as np
 import cv2
 from PIL import Image
 from utils.geospatial import extract_contours, simplify_polygons, regularize_polygons, merge_nearby_polygons
 
+# In-process cache of full segmentation results keyed by image content hash
+# and pipeline parameters; re-requesting the same tile skips the whole CV
+# pipeline. Bounded so masks for old tiles do not accumulate.
+_SEGMENTATION_CACHE = {}
+_SEGMENTATION_CACHE_MAX = 8
+
+def _file_digest(path):
+    """Return a content hash of the file at path, streamed in 1 MB blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+@lru_cache(maxsize=8)
+def _gaussian_kernel(sigma):
+    """Return a cached 1-D Gaussian kernel for the given sigma."""
+    ksize = int(sigma * 6 + 1) | 1  # odd size covering +/-3 sigma
+    return cv2.getGaussianKernel(ksize, sigma)
+
+def _gaussian_smooth(channel, sigma):
+    """Smooth a single-channel image with a separable Gaussian filter.
+
+    Two 1-D passes via sepFilter2D cost O(k) per pixel instead of the
+    O(k^2) of an equivalent 2-D convolution, and the kernel itself is
+    cached across calls with the same sigma.
+    """
+    kernel = _gaussian_kernel(sigma)
+    return cv2.sepFilter2D(channel, -1, kernel, kernel)
+
 def segment_by_color_threshold(image_path, output_path=None, 
                               threshold=127, color_channel=1, 
                               smoothing_sigma=1.0):
@@ -36,19 +67,18 @@ def segment_by_color_threshold(image_path, output_path=None,
             img = np.array(pil_img)
             img = img[:, :, ::-1]  # RGB to BGR for OpenCV compatibility
         
-        # Split channels and use the specified channel for segmentation
-        b, g, r = cv2.split(img)
-        channels = [r, g, b]
-        
+        # Copy out only the requested channel; cv2.split materialized all
+        # three planes just to threshold one of them. OpenCV stores BGR, so
+        # channel 0 (R) lives at plane index 2.
         if 0 <= color_channel < 3:
-            channel = channels[color_channel]
+            channel = np.ascontiguousarray(img[:, :, 2 - color_channel])
         else:
             # Use grayscale if invalid channel specified
             channel = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         
         # Apply Gaussian blur to reduce noise
         if smoothing_sigma > 0:
-            channel = cv2.GaussianBlur(channel, (0, 0), smoothing_sigma)
+            channel = _gaussian_smooth(channel, smoothing_sigma)
         
         # Apply thresholding to create binary mask
         _, mask = cv2.threshold(channel, threshold, 255, cv2.THRESH_BINARY)
@@ -56,12 +86,12 @@ def segment_by_color_threshold(image_path, output_path=None,
         # Save the mask if output path is provided
         if output_path:
             cv2.imwrite(output_path, mask)
-            logging.info(f"Saved segmentation mask to {output_path}")
+            logging.info("Saved segmentation mask to %s", output_path)
             
         return mask
         
     except Exception as e:
-        logging.error(f"Error in segmentation: {str(e)}")
+        logging.error("Error in segmentation: %s", e)
         return None
 
 def segment_by_adaptive_threshold(image_path, output_path=None, 
@@ -82,20 +112,17 @@ def segment_by_adaptive_threshold(image_path, output_path=None,
         numpy.ndarray: Segmentation mask
     """
     try:
-        # Read the image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Read the image as grayscale directly; decoding three channels only
+        # to collapse them again wastes both bandwidth and a cvtColor pass
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             # Try using PIL if OpenCV fails
-            pil_img = Image.open(image_path).convert('RGB')
-            img = np.array(pil_img)
-            img = img[:, :, ::-1]  # RGB to BGR for OpenCV compatibility
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            pil_img = Image.open(image_path).convert('L')
+            gray = np.array(pil_img)
         
         # Apply Gaussian blur to reduce noise
         if smoothing_sigma > 0:
-            gray = cv2.GaussianBlur(gray, (0, 0), smoothing_sigma)
+            gray = _gaussian_smooth(gray, smoothing_sigma)
         
         # Apply adaptive thresholding
         mask = cv2.adaptiveThreshold(
@@ -106,12 +133,12 @@ def segment_by_adaptive_threshold(image_path, output_path=None,
         # Save the mask if output path is provided
         if output_path:
             cv2.imwrite(output_path, mask)
-            logging.info(f"Saved segmentation mask to {output_path}")
+            logging.info("Saved segmentation mask to %s", output_path)
             
         return mask
         
     except Exception as e:
-        logging.error(f"Error in segmentation: {str(e)}")
+        logging.error("Error in segmentation: %s", e)
         return None
 
 def segment_by_otsu(image_path, output_path=None, smoothing_sigma=1.0):
@@ -127,20 +154,17 @@ def segment_by_otsu(image_path, output_path=None, smoothing_sigma=1.0):
         numpy.ndarray: Segmentation mask
     """
     try:
-        # Read the image
-        img = cv2.imread(image_path)
-        if img is None:
+        # Read the image as grayscale directly; decoding three channels only
+        # to collapse them again wastes both bandwidth and a cvtColor pass
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             # Try using PIL if OpenCV fails
-            pil_img = Image.open(image_path).convert('RGB')
-            img = np.array(pil_img)
-            img = img[:, :, ::-1]  # RGB to BGR for OpenCV compatibility
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            pil_img = Image.open(image_path).convert('L')
+            gray = np.array(pil_img)
         
         # Apply Gaussian blur to reduce noise
         if smoothing_sigma > 0:
-            gray = cv2.GaussianBlur(gray, (0, 0), smoothing_sigma)
+            gray = _gaussian_smooth(gray, smoothing_sigma)
         
         # Apply Otsu's thresholding
         _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -148,15 +172,30 @@ def segment_by_otsu(image_path, output_path=None, smoothing_sigma=1.0):
         # Save the mask if output path is provided
         if output_path:
             cv2.imwrite(output_path, mask)
-            logging.info(f"Saved segmentation mask to {output_path}")
+            logging.info("Saved segmentation mask to %s", output_path)
             
         return mask
         
     except Exception as e:
-        logging.error(f"Error in segmentation: {str(e)}")
+        logging.error("Error in segmentation: %s", e)
         return None
 
-def segment_and_extract_features(image_path, output_mask_path=None, 
+# Segmenter and tuned parameters per feature type, resolved with one dict
+# lookup per request. Buildings have clean edges and good contrast, trees
+# and vegetation are strong in the green channel, and water has distinct
+# spectral properties; anything else falls back to Otsu.
+_SEGMENTER_PRESETS = {
+    "buildings": (segment_by_adaptive_threshold,
+                  {"block_size": 15, "c": 2, "smoothing_sigma": 1.0}),
+    "trees": (segment_by_color_threshold,
+              {"threshold": 140, "color_channel": 1, "smoothing_sigma": 1.5}),
+    "vegetation": (segment_by_color_threshold,
+                   {"threshold": 140, "color_channel": 1, "smoothing_sigma": 1.5}),
+    "water": (segment_by_color_threshold,
+              {"threshold": 120, "color_channel": 0, "smoothing_sigma": 2.0}),
+}
+
+def segment_and_extract_features(image_path, output_mask_path=None,
                                 feature_type="buildings", 
                                 min_area=50, simplify_tolerance=2.0,
                                 merge_distance=5.0):
@@ -174,64 +213,59 @@ def segment_and_extract_features(image_path, output_mask_path=None,
     Returns:
         tuple: (mask, polygons) - Segmentation mask and list of simplified Shapely polygons
     """
-    # Choose segmentation method based on feature type
-    if feature_type.lower() == "buildings":
-        # Buildings typically have clean edges and good contrast
-        mask = segment_by_adaptive_threshold(
-            image_path, output_mask_path, 
-            block_size=15, c=2, smoothing_sigma=1.0
-        )
-    elif feature_type.lower() == "trees" or feature_type.lower() == "vegetation":
-        # Trees typically strong in green channel
-        mask = segment_by_color_threshold(
-            image_path, output_mask_path,
-            threshold=140, color_channel=1, smoothing_sigma=1.5
-        )
-    elif feature_type.lower() == "water":
-        # Water typically has distinct spectral properties
-        mask = segment_by_color_threshold(
-            image_path, output_mask_path,
-            threshold=120, color_channel=0, smoothing_sigma=2.0
-        )
-    else:
-        # Default to Otsu for unknown feature types
-        mask = segment_by_otsu(
-            image_path, output_mask_path, smoothing_sigma=1.0
+    feature_key = feature_type.lower()
+
+    # Serve repeats of the same image and parameters from the cache; hashing
+    # the file is orders of magnitude cheaper than re-running the pipeline
+    try:
+        cache_key = (
+            _file_digest(image_path), feature_key,
+            min_area, simplify_tolerance, merge_distance
         )
-    
+    except OSError:
+        cache_key = None
+
+    if cache_key is not None and cache_key in _SEGMENTATION_CACHE:
+        mask, polygons = _SEGMENTATION_CACHE[cache_key]
+        logging.info("Segmentation cache hit for %s", image_path)
+        if output_mask_path:
+            cv2.imwrite(output_mask_path, mask)
+        # Copy the mask as well as the polygon list; returning the cached
+        # ndarray would let in-place edits corrupt later hits
+        return mask.copy(), list(polygons)
+
+    # Choose segmentation method based on feature type
+    segmenter, params = _SEGMENTER_PRESETS.get(
+        feature_key, (segment_by_otsu, {"smoothing_sigma": 1.0})
+    )
+    mask = segmenter(image_path, output_mask_path, **params)
+
     if mask is None:
         logging.error("Segmentation failed")
         return None, []
     
-    # Save mask temporarily if needed for contour extraction
-    temp_mask_path = None
-    if not output_mask_path:
-        temp_mask_path = os.path.join(
-            os.path.dirname(image_path),
-            f"{os.path.splitext(os.path.basename(image_path))[0]}_mask.png"
-        )
-        cv2.imwrite(temp_mask_path, mask)
-        mask_path = temp_mask_path
-    else:
-        mask_path = output_mask_path
-    
-    # Extract contours from the mask
-    polygons = extract_contours(mask_path, min_area=min_area)
-    logging.info(f"Extracted {len(polygons)} initial polygons")
-    
-    # Clean up temporary file if created
-    if temp_mask_path and os.path.exists(temp_mask_path):
-        os.remove(temp_mask_path)
-    
+    # Extract contours straight from the in-memory mask; the segmentation
+    # helpers already persist it when output_mask_path is set, so there is
+    # no need for a temporary PNG encode/decode round-trip
+    polygons = extract_contours(output_mask_path, min_area=min_area, mask=mask)
+    logging.info("Extracted %s initial polygons", len(polygons))
+
     # Simplify polygons
     polygons = simplify_polygons(polygons, tolerance=simplify_tolerance)
     
     # If buildings, regularize them to make more rectangular
-    if feature_type.lower() == "buildings":
+    if feature_key == "buildings":
         polygons = regularize_polygons(polygons)
     
     # Merge nearby polygons to reduce count
     polygons = merge_nearby_polygons(polygons, distance_threshold=merge_distance)
-    logging.info(f"After processing: {len(polygons)} polygons")
-    
+    logging.info("After processing: %s polygons", len(polygons))
+
+    if cache_key is not None:
+        if len(_SEGMENTATION_CACHE) >= _SEGMENTATION_CACHE_MAX:
+            _SEGMENTATION_CACHE.pop(next(iter(_SEGMENTATION_CACHE)))
+        # Store a private copy of the mask too: the caller receives the
+        # original array and may edit it in place
+        _SEGMENTATION_CACHE[cache_key] = (mask.copy(), list(polygons))
+
     return mask, polygons
\ No newline at end of file